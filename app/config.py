@@ -0,0 +1,32 @@
+"""Module to load the service configuration file."""
+
+import configparser
+import functools
+from pathlib import Path
+
+# Resolved once at import, every service path is built from this directory
+CWD = Path.cwd()
+
+
+def get_config(path: str = "config.ini") -> configparser.ConfigParser:
+    """Return the parsed configuration file.
+
+    The parsed file is cached and reloaded only when its modification time changes.
+
+    :param path: Path of the configuration file, relative to the working directory at
+                 import (default: 'config.ini')
+    :type path: str
+    :return: Parsed configuration
+    :rtype: configparser.ConfigParser
+    """
+    config_path = CWD / path
+    mtime = config_path.stat().st_mtime
+    return _load_config(str(config_path), mtime)
+
+
+@functools.lru_cache(maxsize=4)
+def _load_config(path: str, mtime: float) -> configparser.ConfigParser:  # noqa: ARG001
+    config = configparser.ConfigParser()
+    config.read(path)
+
+    return config
@@ -1,11 +1,10 @@
 """Module for downloading reports from SharePoint and converting PDFs to images."""
 
-import configparser
 from datetime import datetime, timezone
-from pathlib import Path
 
-from pdf2image import convert_from_path
+import pypdfium2 as pdfium
 
+from app.config import CWD, get_config
 from app.graph_api import GraphAPIClient
 from app.logger import get_logger
 
@@ -18,8 +17,7 @@ def download_report(report_type: str, image_page: int = 0) -> None:
     :param report_type: Type of report to download ('daily' or 'weekly')
     :type report_type: str
     """
-    config = configparser.ConfigParser()
-    config.read("config.ini")
+    config = get_config()
 
     local_path = config["Generic"]["local_path"]
     site_name = config["Sharepoint"]["site_name"]
@@ -34,31 +32,36 @@ def download_report(report_type: str, image_page: int = 0) -> None:
     )
 
     for file in files:
-        filename = file["name"]
+        logger.info("Found file for %s: %s", report_type, file["name"])
 
-        logger.info("Found file for %s: %s", report_type, filename)
+    report_type_path = report_type.lower().replace(" ", "_")
+    local_path_obj = CWD / local_path / report_type_path
+    local_pdf_path = local_path_obj / "pdf"
 
-        report_type_path = report_type.lower().replace(" ", "_")
-        local_path_obj = Path.cwd() / local_path / report_type_path
-        local_pdf_path = local_path_obj / "pdf"
-
-        output_filename = microsoft_client.download_file(
-            site_name, file, local_pdf_path
-        )
+    output_filenames = microsoft_client.download_files(site_name, files, local_pdf_path)
+    for output_filename in output_filenames:
         _save_image(output_filename, local_path_obj, image_page)
 
 
 def _save_image(pdf_filename: str, local_path: str, image_page: int) -> None:
-    local_path_image = Path.cwd() / local_path / "image"
+    local_path_image = CWD / local_path / "image"
     local_path_image.mkdir(parents=True, exist_ok=True)
 
     image_pathname = local_path_image / pdf_filename
-    images = convert_from_path(image_pathname, dpi=200, fmt="jpeg")
-
-    if images:
-        pdf_name = image_pathname.stem
-        image_path = local_path_image / f"{pdf_name}.jpg"
-        images[image_page].save(image_path, "JPEG")
-        logger.info("Saved image: %s", image_path)
-    else:
-        logger.error("No images found in the PDF file.")
+    pdf = pdfium.PdfDocument(image_pathname)
+
+    try:
+        page_index = image_page + len(pdf) if image_page < 0 else image_page
+        if 0 <= page_index < len(pdf):
+            pdf_name = image_pathname.stem
+            image_path = local_path_image / f"{pdf_name}.jpg"
+            page = pdf[page_index]
+            try:
+                page.render(scale=200 / 72).to_pil().save(image_path, "JPEG")
+            finally:
+                page.close()
+            logger.info("Saved image: %s", image_path)
+        else:
+            logger.error("Page %s not found in the PDF file.", image_page)
+    finally:
+        pdf.close()
@@ -1,11 +1,20 @@
 """Module to read manual inserted data."""
 
+from __future__ import annotations
+
+import asyncio
+import functools
+import shutil
+from concurrent.futures import ThreadPoolExecutor
 from http import HTTPStatus
 from pathlib import Path
 
+import aiohttp
 import requests
 from msal import ConfidentialClientApplication
+from requests.adapters import HTTPAdapter
 
+from app.config import CWD
 from app.logger import get_logger
 
 logger = get_logger()
@@ -24,6 +33,9 @@ class GraphAPIClient:
         authority_url = "https://login.microsoftonline.com/"
         scope = "https://graph.microsoft.com/.default"
         graph_url = "https://graph.microsoft.com/v1.0/sites/"
+        pool_size = 16
+        max_workers = 8
+        chunk_size = 1 << 20
 
     def __init__(
         self,
@@ -47,9 +59,18 @@ class GraphAPIClient:
         self.client_id = client_id
         self.client_secret = client_secret
         self.microsoft_host = microsoft_host
+        self._msal_app = None
+        self._site_ids = {}
+
+        self._session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=self.Constants.pool_size,
+            pool_maxsize=self.Constants.pool_size,
+        )
+        self._session.mount("https://", adapter)
 
     @classmethod
-    def from_config(cls, config: dict) -> "GraphAPIClient":
+    def from_config(cls, config: dict) -> GraphAPIClient:
         """Create a GraphAPIClient instance from a configuration dictionary.
 
         :param config: Dictionary containing Microsoft Graph API configuration
@@ -64,49 +85,111 @@ class GraphAPIClient:
             microsoft_host=config["microsoft_host"],
         )
 
-    def _authenticate(self) -> str:
-        logger.info("Authenticating to Microsoft Graph API %s", self.microsoft_host)
-
-        app = ConfidentialClientApplication(
-            self.client_id,
-            authority=f"{self.Constants.authority_url}{self.tenant_id}",
-            client_credential=self.client_secret,
-        )
+    def _authenticate(self) -> None:
+        if self._msal_app is None:
+            logger.info("Authenticating to Microsoft Graph API %s", self.microsoft_host)
+            self._msal_app = ConfidentialClientApplication(
+                self.client_id,
+                authority=f"{self.Constants.authority_url}{self.tenant_id}",
+                client_credential=self.client_secret,
+            )
 
-        result = app.acquire_token_for_client(scopes=[self.Constants.scope])
+        result = self._msal_app.acquire_token_for_client(scopes=[self.Constants.scope])
         if "access_token" not in result:
             msg = f"Failed to get token: {result}"
             raise Exception(msg)
 
-        return result["access_token"]
+        self._session.headers["Authorization"] = f"Bearer {result['access_token']}"
+
+    def _get_site_id(self, site_name: str) -> str:
+        if site_name not in self._site_ids:
+            site_url = (
+                f"{self.Constants.graph_url}{self.microsoft_host}:/sites/{site_name}"
+            )
+            site = self._session.get(site_url, timeout=10).json()
+            self._site_ids[site_name] = site["id"]
+
+        return self._site_ids[site_name]
+
+    def _list_files(self, site_id: str, remote_folder: str) -> list[dict]:
+        folder_url = (
+            f"{self.Constants.graph_url}/{site_id}/drive/root:/"
+            f"{remote_folder}:/children"
+        )
+        response = self._session.get(folder_url, timeout=10)
+
+        if response.status_code != HTTPStatus.OK:
+            msg = f"Failed to list files: {response.text}"
+            raise Exception(msg)
+
+        return response.json().get("value", [])
+
+    def _prepare_folder_download(
+        self, site_name: str, remote_folder: str, local_folder: str, local_path: str
+    ) -> tuple[str, list[dict], Path]:
+        self._authenticate()
+
+        site_id = self._get_site_id(site_name)
+        files = self._list_files(site_id, remote_folder)
+
+        logger.info("Found %s files in the folder %s", len(files), remote_folder)
+
+        local_path = local_path / local_folder
+        self._create_folder(local_path)
+
+        return site_id, files, local_path
 
     def _create_folder(self, folder_name: str) -> None:
         logger.info("Creating local directory for folder %s", folder_name)
 
-        local_dir = Path.cwd() / folder_name
+        local_dir = CWD / folder_name
         local_dir.mkdir(parents=True, exist_ok=True)
 
     def _download_all(
-        self, site_id: str, token: str, files: list[str], local_dir: str
-    ) -> None:
-        for file in files:
-            file_name = file["name"]
-            file_id = file["id"]
+        self, site_id: str, files: list[dict], local_dir: str
+    ) -> list[Path]:
+        download = functools.partial(self._download_one, site_id, local_dir)
 
-            headers = {"Authorization": f"Bearer {token}"}
-            download_url = (
-                f"{self.Constants.graph_url}/{site_id}/drive/items/{file_id}/content"
-            )
-            response = requests.get(download_url, headers=headers, timeout=10)
+        with ThreadPoolExecutor(max_workers=self.Constants.max_workers) as executor:
+            output_files = list(executor.map(download, files))
+
+        return [output_file for output_file in output_files if output_file]
+
+    def _download_one(self, site_id: str, local_dir: str, file: dict) -> Path | None:
+        file_id = file["id"]
+        output_file = local_dir / file["name"]
+
+        download_url = (
+            f"{self.Constants.graph_url}/{site_id}/drive/items/{file_id}/content"
+        )
+        if self._stream_to_file(download_url, output_file):
+            return output_file
+
+        return None
+
+    def _stream_to_file(self, download_url: str, output_file: Path) -> bool:
+        with self._session.get(download_url, stream=True, timeout=60) as response:
+            if response.status_code != HTTPStatus.OK:
+                logger.error(
+                    "Failed to download file %s: %s", output_file.name, response.text
+                )
+                return False
+
+            response.raw.decode_content = True
+            part_file = output_file.with_suffix(".part")
+            try:
+                with Path.open(part_file, "wb") as f:
+                    shutil.copyfileobj(
+                        response.raw, f, length=self.Constants.chunk_size
+                    )
+            except BaseException:
+                part_file.unlink(missing_ok=True)
+                raise
 
-            if response.status_code == HTTPStatus.OK:
-                output_file = local_dir / file_name
+        part_file.replace(output_file)
 
-                with Path.open(output_file, "wb") as f:
-                    f.write(response.content)
-                logger.info("Downloading file %s", file_name)
-            else:
-                logger.error("Failed to download file %s: %S", file_name, response.text)
+        logger.info("Downloaded file %s", output_file.name)
+        return True
 
     def search_file(
         self, site_name: str, remote_folder: str, expression: str
@@ -125,24 +208,10 @@ class GraphAPIClient:
         :return: List of matching files
         :rtype: list[dict]
         """
-        token = self._authenticate()
+        self._authenticate()
 
-        headers = {"Authorization": f"Bearer {token}"}
-        site_url = f"{self.Constants.graph_url}{self.microsoft_host}:/sites/{site_name}"
-        site = requests.get(site_url, headers=headers, timeout=10).json()
-        site_id = site["id"]
-
-        folder_url = (
-            f"{self.Constants.graph_url}/{site_id}/drive/root:/"
-            f"{remote_folder}:/children"
-        )
-        response = requests.get(folder_url, headers=headers, timeout=10)
-
-        if response.status_code != HTTPStatus.OK:
-            msg = f"Failed to list files: {response.text}"
-            raise Exception(msg)
-
-        files = response.json().get("value", [])
+        site_id = self._get_site_id(site_name)
+        files = self._list_files(site_id, remote_folder)
         matched_files = [f for f in files if expression in f["name"]]
 
         logger.info(
@@ -163,29 +232,33 @@ class GraphAPIClient:
         :return: The filename of the downloaded file or None if failed
         :rtype: str
         """
-        token = self._authenticate()
+        self._authenticate()
 
-        headers = {"Authorization": f"Bearer {token}"}
-        site_url = f"{self.Constants.graph_url}{self.microsoft_host}:/sites/{site_name}"
-        site = requests.get(site_url, headers=headers, timeout=10).json()
-        site_id = site["id"]
-        file_id = file["id"]
+        site_id = self._get_site_id(site_name)
 
-        download_url = (
-            f"{self.Constants.graph_url}/{site_id}/drive/items/{file_id}/content"
-        )
-        response = requests.get(download_url, headers=headers, timeout=10)
+        return self._download_one(site_id, local_path, file)
 
-        output_filename = local_path / file["name"]
-        if response.status_code == HTTPStatus.OK:
-            with Path.open(output_filename, "wb") as f:
-                f.write(response.content)
+    def download_files(
+        self, site_name: str, files: list[dict], local_path: str
+    ) -> list[Path]:
+        """Download several files from SharePoint to a local path.
 
-            logger.info("Downloaded file %s", file["name"])
-            return output_filename
+        The token and the site id are resolved once for the whole batch.
 
-        logger.error("Failed to download file %s", file["name"])
-        return None
+        :param site_name: The SharePoint site name
+        :type site_name: str
+        :param files: The file metadata dictionaries containing 'id' and 'name'
+        :type files: list[dict]
+        :param local_path: The local directory path to save the downloaded files
+        :type local_path: str
+        :return: The filenames of the successfully downloaded files
+        :rtype: list[Path]
+        """
+        self._authenticate()
+
+        site_id = self._get_site_id(site_name)
+
+        return self._download_all(site_id, files, local_path)
 
     def download_folder(
         self, site_name: str, remote_folder: str, local_folder: str, local_path: str
@@ -201,83 +274,150 @@ class GraphAPIClient:
         :param local_path: The base local path where the local_folder will be created
         :type local_path: str
         """
-        token = self._authenticate()
+        site_id, files, local_path = self._prepare_folder_download(
+            site_name, remote_folder, local_folder, local_path
+        )
+        self._download_all(site_id, files, local_path)
 
-        headers = {"Authorization": f"Bearer {token}"}
-        site_url = f"{self.Constants.graph_url}{self.microsoft_host}:/sites/{site_name}"
-        site = requests.get(site_url, headers=headers, timeout=10).json()
-        site_id = site["id"]
+        logger.info("Download completed from SharePoint %s", self.microsoft_host)
 
-        folder_url = (
-            f"{self.Constants.graph_url}/{site_id}/drive/root:/"
-            f"{remote_folder}:/children"
-        )
-        response = requests.get(folder_url, headers=headers, timeout=10)
+    async def download_folder_async(
+        self, site_name: str, remote_folder: str, local_folder: str, local_path: str
+    ) -> None:
+        """Download all files from a SharePoint folder concurrently with asyncio.
 
-        if response.status_code != HTTPStatus.OK:
-            msg = f"Failed to get files: {response.text}"
-            raise Exception(msg)
+        Behaves like `download_folder`, but the file downloads run as coroutines on
+        a single aiohttp session. The blocking authentication and folder listing run
+        in a worker thread, the downloaded chunks are written to disk directly from
+        the event loop.
 
-        files = response.json().get("value", [])
+        :param site_name: The SharePoint site name
+        :type site_name: str
+        :param remote_folder: The remote SharePoint folder to download from
+        :type remote_folder: str
+        :param local_folder: The local folder name to save files into
+        :type local_folder: str
+        :param local_path: The base local path where the local_folder will be created
+        :type local_path: str
+        """
+        site_id, files, local_path = await asyncio.to_thread(
+            self._prepare_folder_download,
+            site_name,
+            remote_folder,
+            local_folder,
+            local_path,
+        )
 
-        logger.info("Found %s files in the folder %s", len(files), remote_folder)
+        connector = aiohttp.TCPConnector(limit=self.Constants.pool_size)
+        headers = {"Authorization": self._session.headers["Authorization"]}
+        async with aiohttp.ClientSession(
+            connector=connector, headers=headers
+        ) as session:
+            results = await asyncio.gather(
+                *(
+                    self._download_one_async(session, site_id, local_path, file)
+                    for file in files
+                ),
+                return_exceptions=True,
+            )
 
-        local_path = local_path / local_folder
-        self._create_folder(local_path)
-        self._download_all(site_id, token, files, local_path)
+        errors = []
+        for file, result in zip(files, results):
+            if isinstance(result, Exception):
+                logger.error("Failed to download file %s: %s", file["name"], result)
+                errors.append(result)
+
+        if errors:
+            raise errors[0]
 
         logger.info("Download completed from SharePoint %s", self.microsoft_host)
 
+    async def _download_one_async(
+        self,
+        session: aiohttp.ClientSession,
+        site_id: str,
+        local_dir: str,
+        file: dict,
+    ) -> None:
+        file_id = file["id"]
+        output_file = local_dir / file["name"]
+
+        download_url = (
+            f"{self.Constants.graph_url}/{site_id}/drive/items/{file_id}/content"
+        )
+        timeout = aiohttp.ClientTimeout(total=None, sock_connect=10, sock_read=60)
+        async with session.get(download_url, timeout=timeout) as response:
+            if response.status != HTTPStatus.OK:
+                logger.error(
+                    "Failed to download file %s: %s",
+                    output_file.name,
+                    await response.text(),
+                )
+                return
+
+            part_file = output_file.with_suffix(".part")
+            try:
+                # Writing a chunk to the page cache is cheaper than a thread hop
+                with Path.open(part_file, "wb") as f:  # noqa: ASYNC230
+                    async for chunk in response.content.iter_chunked(
+                        self.Constants.chunk_size
+                    ):
+                        f.write(chunk)
+            except BaseException:
+                part_file.unlink(missing_ok=True)
+                raise
+
+        part_file.replace(output_file)
+
+        logger.info("Downloaded file %s", output_file.name)
+
     def _upload_all(
         self,
         site_id: str,
-        token: str,
         remote_folder: str,
         local_folder: str,
     ) -> None:
-        files = Path.iterdir(local_folder)
+        files = sorted(f for f in Path(local_folder).iterdir() if f.is_file())
         logger.info("Found %s files in the folder %s", len(files), local_folder)
 
-        for file in files:
-            filename = file
-            local_path = local_folder / filename
+        upload = functools.partial(self._upload_one, site_id, remote_folder)
 
-            with Path.open(local_path, "rb") as file_data:
-                headers = {"Authorization": f"Bearer {token}"}
+        with ThreadPoolExecutor(max_workers=self.Constants.max_workers) as executor:
+            list(executor.map(upload, files))
 
-                upload_url = (
-                    f"{self.Constants.graph_url}/{site_id}/drive/root:/"
-                    f"{remote_folder}/{filename}:/content"
-                )
-                upload_resp = requests.put(
-                    upload_url,
-                    headers=headers,
-                    data=file_data,
-                    timeout=30,
-                )
-                if upload_resp.status_code in [200, 201]:
-                    logger.info("Uploaded file %s", filename)
-                else:
-                    logger.error("Failed to upload file %s", filename)
+    def _upload_one(self, site_id: str, remote_folder: str, file: Path) -> None:
+        upload_url = (
+            f"{self.Constants.graph_url}/{site_id}/drive/root:/"
+            f"{remote_folder}/{file.name}:/content"
+        )
 
-    def upload(self, remote_folder: str, local_folder: str) -> None:
+        with Path.open(file, "rb") as file_data:
+            upload_resp = self._session.put(
+                upload_url,
+                data=file_data,
+                timeout=30,
+            )
+
+        if upload_resp.status_code in [HTTPStatus.OK, HTTPStatus.CREATED]:
+            logger.info("Uploaded file %s", file.name)
+        else:
+            logger.error("Failed to upload file %s", file.name)
+
+    def upload(self, site_name: str, remote_folder: str, local_folder: str) -> None:
         """Upload all files from a local folder to a SharePoint folder.
 
+        :param site_name: The SharePoint site name
+        :type site_name: str
         :param remote_folder: The remote SharePoint folder to upload to
         :type remote_folder: str
         :param local_folder: The local folder path containing files to upload
         :type local_folder: str
         """
-        token = self._authenticate()
+        self._authenticate()
 
-        headers = {"Authorization": f"Bearer {token}"}
-        site_url = (
-            f"{self.Constants.graph_url}{self.microsoft_host}:/sites/{self.site_name}"
-        )
-        site = requests.get(site_url, headers=headers, timeout=10).json()
-        site_id = site["id"]
+        site_id = self._get_site_id(site_name)
 
-        self._upload_all(site_id, token, remote_folder, local_folder)
+        self._upload_all(site_id, remote_folder, local_folder)
 
         logger.info("Upload completed to SharePoint %s", self.microsoft_host)
 
@@ -288,16 +428,11 @@ class GraphAPIClient:
                       'body', 'to_recipients', and optional 'cc_recipients'
         :type email: dict
         """
-        token = self._authenticate()
+        self._authenticate()
 
         endpoint = f"https://graph.microsoft.com/v1.0/users/{sender}/sendMail"
-        headers = {
-            "Authorization": f"Bearer {token}",
-            "Content-Type": "application/json",
-        }
-        response = requests.post(
+        response = self._session.post(
             endpoint,
-            headers=headers,
             json=email,
             timeout=10,
         )
@@ -1,14 +1,18 @@
 """Logging module for the data warehouse ETL process."""
 
 import logging
+from logging.handlers import RotatingFileHandler
 from pathlib import Path
 
+from app.config import CWD
+
 
 def get_logger(level: str = logging.INFO) -> logging.Logger:
     """Initialize and configure a logger instance.
 
     The logger is named after the current script filename and uses the specified logging
-    level.
+    level. Handlers are attached only on the first call, later calls return the same
+    logger.
 
     :param level: Logging level (default: logging.INFO)
     :type level: int or str
@@ -21,12 +25,24 @@ def get_logger(level: str = logging.INFO) -> logging.Logger:
 
     filename = Path(__import__("sys").argv[0]).name
     logger = logging.getLogger(filename)
-    log_path = Path.cwd() / "dwh.log"
+    if logger.handlers:
+        return logger
+
+    logger.setLevel(level)
+    logger.propagate = False
 
-    file_handler = logging.FileHandler(log_path)
+    formatter = logging.Formatter(log_format)
+    log_path = CWD / "dwh.log"
+
+    file_handler = RotatingFileHandler(log_path, maxBytes=10 << 20, backupCount=3)
     file_handler.setLevel(level)
-    file_handler.setFormatter(logging.Formatter(log_format))
+    file_handler.setFormatter(formatter)
+
+    stream_handler = logging.StreamHandler()
+    stream_handler.setLevel(level)
+    stream_handler.setFormatter(formatter)
 
     logger.addHandler(file_handler)
+    logger.addHandler(stream_handler)
 
     return logger
@@ -3,16 +3,20 @@
 from __future__ import annotations
 
 import base64
-import configparser
-import re
+import mmap
+import os
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
 from pathlib import Path
 
+from app.config import CWD, get_config
 from app.graph_api import GraphAPIClient
 from app.logger import get_logger
 
 logger = get_logger()
 
+_EXECUTOR = ThreadPoolExecutor(max_workers=4)
+
 
 def send_mail(report_type: str, subject: str, date: datetime | None = None) -> None:
     """Send an email with the report as an attachment.
@@ -24,8 +28,7 @@ def send_mail(report_type: str, subject: str, date: datetime | None = None) -> N
     :param date: Date of the report to send, defaults to None
     :type date: datetime | None, optional
     """
-    config = configparser.ConfigParser()
-    config.read("config.ini")
+    config = get_config()
 
     local_path = config["Generic"]["local_path"]
     microsoft_config = config["Microsoft"]
@@ -40,23 +43,28 @@ def send_mail(report_type: str, subject: str, date: datetime | None = None) -> N
 
 
 def _create_message(report_type_path: str, subject: str, date: datetime) -> dict:
+    recipients = _EXECUTOR.submit(_get_recipients, report_type_path)
+    body = _EXECUTOR.submit(_get_body, report_type_path)
+    pdf = _EXECUTOR.submit(_get_pdf, report_type_path, date)
+    image = _EXECUTOR.submit(_get_image, report_type_path, date)
+
     return {
         "message": {
             "subject": subject,
-            "toRecipients": _get_recipients(report_type_path),
-            "body": {"contentType": "HTML", "content": _get_body(report_type_path)},
+            "toRecipients": recipients.result(),
+            "body": {"contentType": "HTML", "content": body.result()},
             "attachments": [
                 {
                     "@odata.type": "#microsoft.graph.fileAttachment",
                     "name": "report.pdf",
                     "contentType": "application/pdf",
-                    "contentBytes": _get_pdf(report_type_path, date),
+                    "contentBytes": pdf.result(),
                 },
                 {
                     "@odata.type": "#microsoft.graph.fileAttachment",
                     "name": "report.png",
                     "contentType": "image/png",
-                    "contentBytes": _get_image(report_type_path, date),
+                    "contentBytes": image.result(),
                     "isInline": True,
                     "contentId": "inline_image",
                 },
@@ -67,66 +75,73 @@ def _create_message(report_type_path: str, subject: str, date: datetime) -> dict
 
 
 def _get_recipients(report_type_path: str) -> list[str]:
-    recipients_path = Path.cwd() / report_type_path / "recipients.txt"
+    recipients_path = CWD / report_type_path / "recipients.txt"
 
-    with Path.open(recipients_path) as f:
-        raw_recipients = [line.strip() for line in f if line.strip()]
-        if raw_recipients:
-            return [{"emailAddress": {"address": email}} for email in raw_recipients]
+    try:
+        with recipients_path.open() as f:
+            raw_recipients = [line.strip() for line in f if line.strip()]
+    except FileNotFoundError:
+        logger.exception("Recipients file not found. Please check the path.")
+        raise
+
+    if raw_recipients:
+        return [{"emailAddress": {"address": email}} for email in raw_recipients]
 
     logger.warning("No recipients found in recipients.txt. Please check the file.")
     return []
 
 
-def _get_body(report_type_path: str) -> str | None:
-    html_content_path = Path.cwd() / report_type_path / "body.html"
-
-    with Path.open(html_content_path) as f:
-        return f.read()
+def _get_body(report_type_path: str) -> str:
+    html_content_path = CWD / report_type_path / "body.html"
 
-    logger.error("HTML content file not found. Please check the path.")
-    return None
+    try:
+        with html_content_path.open() as f:
+            return f.read()
+    except FileNotFoundError:
+        logger.exception("HTML content file not found. Please check the path.")
+        raise
 
 
 def _get_image(report_type_path: str, date: datetime | None) -> str:
-    image_path = Path.cwd() / report_type_path / "image"
+    image_path = CWD / report_type_path / "image"
     image_file = _get_file(image_path, date)
 
-    with Path.open(image_file, "rb") as f:
-        image_data = f.read()
-
-        return base64.b64encode(image_data).decode("utf-8")
+    if image_file is None:
+        msg = f"Image file not found in {image_path}. Please check the path."
+        logger.error(msg)
+        raise FileNotFoundError(msg)
 
-    msg = "Image path is not set. Please provide a valid image path."
-    raise ValueError(msg)
+    return _encode_file(image_file)
 
 
 def _get_pdf(report_type_path: str, date: datetime | None) -> str:
-    pdf_path = Path.cwd() / report_type_path / "pdf"
+    pdf_path = CWD / report_type_path / "pdf"
     pdf_file = _get_file(pdf_path, date)
 
-    with Path.open(pdf_file, "rb") as f:
-        pdf_data = f.read()
+    if pdf_file is None:
+        msg = f"PDF file not found in {pdf_path}. Please check the path."
+        logger.error(msg)
+        raise FileNotFoundError(msg)
+
+    return _encode_file(pdf_file)
+
 
-        return base64.b64encode(pdf_data).decode("utf-8")
+def _encode_file(file_path: Path) -> str:
+    with file_path.open("rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return ""
 
-    msg = "PDF path is not set. Please provide a valid PDF path."
-    raise ValueError(msg)
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            return base64.b64encode(mm).decode("ascii")
 
 
-def _get_file(path: str, date: datetime | None) -> str:
+def _get_file(path: str, date: datetime | None) -> Path | None:
     if date is None:
         date = datetime.now(tz=timezone.utc)
 
-    files = [f for f in Path(path).iterdir() if f.is_file()]
-
-    for file in files:
-        match = re.search(r"(\d{4}-\d{2}-\d{2})", file.name)
-        if match:
-            file_date = datetime.strptime(match.group(1), "%Y-%m-%d").replace(
-                tzinfo=timezone.utc
-            )
-            if file_date.date() == date.date():
-                logger.info("Found file for today: %s", file)
-                return file
+    target = date.strftime("%Y-%m-%d")
+    for file in Path(path).glob(f"*{target}*"):
+        if file.is_file():
+            logger.info("Found file for today: %s", file)
+            return file
     return None